@@ -51,10 +51,13 @@ if platform.system() == "Windows":
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-    # Configurar la consola para UTF-8 si es posible
+    # Configurar la consola para UTF-8 sin spawnear cmd.exe (chcp):
+    # una llamada directa a kernel32 hace lo mismo en el propio proceso
     try:
-        os.system('chcp 65001 >nul 2>&1')
-    except:
+        import ctypes
+        ctypes.windll.kernel32.SetConsoleOutputCP(65001)
+        ctypes.windll.kernel32.SetConsoleCP(65001)
+    except (OSError, AttributeError):
         pass
 
 def get_config_path():
@@ -4,16 +4,26 @@
 Script para probar que las leyendas innecesarias fueron eliminadas correctamente.
 """
 
+import re
+
+# Leer setup.py una sola vez para ambos tests (antes cada test lo releía)
+with open("setup.py", 'r', encoding='utf-8') as f:
+    _SETUP_SRC = f.read()
+
+def _present_messages(messages):
+    """Devuelve el conjunto de mensajes presentes en setup.py.
+
+    Una sola alternación compilada recorre el contenido una vez, en lugar de
+    un escaneo lineal completo por cada mensaje buscado.
+    """
+    pattern = re.compile('|'.join(re.escape(m) for m in messages))
+    return {m.group() for m in pattern.finditer(_SETUP_SRC)}
+
 def test_removed_messages():
     """Verifica que los mensajes eliminados no estén en el código."""
-    
-    setup_py_path = "setup.py"
-    
+
     print("🧪 === VERIFICANDO ELIMINACIÓN DE LEYENDAS ===\n")
-    
-    with open(setup_py_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+
     # Mensajes que deben haber sido eliminados
     removed_messages = [
         "y reemplazar el archivo: upload/certs/ssn_cert_test_20250903.pem",
@@ -23,11 +33,12 @@ def test_removed_messages():
         "Re-ejecutando script con el entorno virtual para configuración completa"
         # Nota: Eliminamos "Configuración completada exitosamente" porque el mensaje principal debe mantenerse
     ]
-    
+
     all_good = True
-    
+    present = _present_messages(removed_messages)
+
     for i, message in enumerate(removed_messages, 1):
-        if message in content:
+        if message in present:
             print(f"❌ {i}. Mensaje aún presente: '{message[:50]}...'")
             all_good = False
         else:
@@ -43,29 +54,25 @@ def test_removed_messages():
 
 def test_essential_messages_remain():
     """Verifica que los mensajes esenciales permanezcan."""
-    
-    setup_py_path = "setup.py"
-    
+
     print("\n🧪 === VERIFICANDO MENSAJES ESENCIALES ===\n")
-    
-    with open(setup_py_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+
     # Mensajes que deben permanecer
     essential_messages = [
         "Configuración inicial del proyecto ETL-SSN",
         "Creación del entorno virtual Python",
         "Instalación de dependencias",
-        "Configuración de credenciales SSN", 
+        "Configuración de credenciales SSN",
         "Configuración del certificado de seguridad",
         "Verificación de la configuración",
         "¡Configuración completada exitosamente!"
     ]
-    
+
     all_present = True
-    
+    present = _present_messages(essential_messages)
+
     for i, message in enumerate(essential_messages, 1):
-        if message in content:
+        if message in present:
             print(f"✅ {i}. Mensaje esencial presente: '{message[:50]}...'")
         else:
             print(f"❌ {i}. Mensaje esencial faltante: '{message[:50]}...'")
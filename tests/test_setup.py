@@ -10,6 +10,11 @@ import subprocess
 import sys
 from pathlib import Path
 
+# Parser único a nivel de módulo, reutilizado por los tres parseos de prueba
+_PARSER = argparse.ArgumentParser()
+_PARSER.add_argument('--use-venv', action='store_true')
+_PARSER.add_argument('--skip-deps', action='store_true')
+
 def test_setup_logic():
     """Prueba la lógica del setup sin hacer instalaciones reales."""
     
@@ -29,19 +34,15 @@ def test_setup_logic():
     print("\n🔍 Verificando parsing de argumentos...")
     
     # Test 1: Sin argumentos
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--use-venv', action='store_true')
-    parser.add_argument('--skip-deps', action='store_true')
-    
-    args1 = parser.parse_args([])
+    args1 = _PARSER.parse_args([])
     print(f"   Sin args: use_venv={args1.use_venv}, skip_deps={args1.skip_deps}")
     
     # Test 2: Solo --use-venv
-    args2 = parser.parse_args(['--use-venv'])
+    args2 = _PARSER.parse_args(['--use-venv'])
     print(f"   Solo --use-venv: use_venv={args2.use_venv}, skip_deps={args2.skip_deps}")
     
     # Test 3: Ambos parámetros
-    args3 = parser.parse_args(['--use-venv', '--skip-deps'])
+    args3 = _PARSER.parse_args(['--use-venv', '--skip-deps'])
     print(f"   Ambos: use_venv={args3.use_venv}, skip_deps={args3.skip_deps}")
     
     print("\n✅ La lógica parece correcta. Ahora:")
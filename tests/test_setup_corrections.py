@@ -4,97 +4,116 @@
 Script para verificar que las correcciones en setup.py funcionan correctamente.
 """
 
+import os
 import subprocess
 import sys
 from pathlib import Path
 
-def test_ssl_import():
-    """Prueba la importación corregida de ssn-mensual."""
-    print("🧪 === PRUEBA: Importación de ssn-mensual ===")
-    
-    python_path = Path('.venv/Scripts/python.exe').absolute()
-    
-    result = subprocess.run(
-        [str(python_path), '-c', """
-import os, sys, importlib.util
-sys.path.insert(0, 'upload')
-os.chdir('upload')
+# Ambas pruebas corren en una sola invocación de Python: el arranque en frío
+# del intérprete (~100-200 ms en Windows) dominaba el costo de cada prueba y
+# antes se pagaba dos veces, recargando ssl/socket/importlib en cada proceso.
+# Las líneas IMPORT_OK/SETENV_OK separan los resultados en la salida.
+_COMBINED_SCRIPT = """
+import os, sys, importlib.util, py_compile, runpy
+
+root = os.getcwd()
 
+# --- Prueba 1: importación de ssn-mensual ---
+ok_import = True
 try:
+    sys.path.insert(0, 'upload')
+    os.chdir('upload')
+
+    # Pre-compilar a __pycache__ si aún no existe el .pyc: las corridas
+    # siguientes de la prueba se ahorran el parseo/compilación del fuente
+    # (el SourceFileLoader de spec_from_file_location reutiliza ese cache)
+    pyc = importlib.util.cache_from_source('ssn-mensual.py')
+    if not os.path.exists(pyc):
+        py_compile.compile('ssn-mensual.py', doraise=True)
+
     # Importar ssn-mensual.py usando importlib
     spec = importlib.util.spec_from_file_location("ssn_mensual", "ssn-mensual.py")
     ssn_mensual = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(ssn_mensual)
     print('✅ Módulo ssn-mensual importado correctamente')
-    
+
     # Verificar que las funciones existen
     if hasattr(ssn_mensual, 'load_config'):
         print('✅ Función load_config disponible')
     else:
         print('❌ Función load_config no encontrada')
-        
+
     if hasattr(ssn_mensual, 'test_ssl_connection'):
         print('✅ Función test_ssl_connection disponible')
     else:
         print('❌ Función test_ssl_connection no encontrada')
-        
+
 except Exception as e:
     print(f'❌ Error en importación: {e}')
-"""],
-        capture_output=True,
-        text=True,
-        encoding='utf-8',
-        errors='replace'
-    )
-    
-    print("Salida:")
-    print(result.stdout)
-    if result.stderr:
-        print("Errores:")
-        print(result.stderr)
-    
-    return result.returncode == 0
-
-def test_set_env():
-    """Prueba que set_env.py funciona sin errores."""
-    print("\n🧪 === PRUEBA: set_env.py ===")
-    
+    ok_import = False
+finally:
+    os.chdir(root)
+
+print('IMPORT_OK' if ok_import else 'IMPORT_FAIL')
+
+# --- Prueba 2: set_env.py ---
+ok_env = True
+try:
+    sys.argv = ['set_env.py', 'prod']
+    runpy.run_path('upload/set_env.py', run_name='__main__')
+except SystemExit as e:
+    ok_env = not e.code
+except Exception as e:
+    print(f'❌ Error en set_env.py: {e}')
+    ok_env = False
+
+print('SETENV_OK' if ok_env else 'SETENV_FAIL')
+"""
+
+def run_probes():
+    """Ejecuta ambas pruebas en un único subproceso de Python del venv."""
     python_path = Path('.venv/Scripts/python.exe').absolute()
-    
+
+    # Captura cruda en bytes con streams fusionados: un solo pipe que se
+    # decodifica una única vez al final, sin el decode incremental del modo
+    # texto. El env asegura salida UTF-8 y que el hijo escriba/reuse el
+    # __pycache__ pre-calentado por la propia prueba: la variable se vacía
+    # porque Python trata cualquier valor NO vacío (incluso '0') como
+    # "no escribir bytecode"
+    env = dict(os.environ,
+               PYTHONIOENCODING='utf-8',
+               PYTHONDONTWRITEBYTECODE='')
     result = subprocess.run(
-        [str(python_path), 'upload/set_env.py', 'prod'],
-        capture_output=True,
-        text=True,
-        encoding='utf-8',
-        errors='replace'
+        [str(python_path), '-c', _COMBINED_SCRIPT],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=env
     )
-    
+    output = result.stdout.decode('utf-8', errors='replace')
+
     print("Salida:")
-    print(result.stdout)
-    if result.stderr:
-        print("Errores:")
-        print(result.stderr)
-    
-    return result.returncode == 0
+    print(output)
+
+    return 'IMPORT_OK' in output, 'SETENV_OK' in output
 
 def main():
     print("🔧 === VERIFICACIÓN DE CORRECCIONES SETUP.PY ===\n")
-    
-    test1_ok = test_ssl_import()
-    test2_ok = test_set_env()
-    
+
+    print("🧪 === PRUEBAS: Importación de ssn-mensual + set_env.py ===")
+    test1_ok, test2_ok = run_probes()
+
     print(f"\n📋 === RESUMEN ===")
     print(f"   Importación ssn-mensual: {'✅' if test1_ok else '❌'}")
     print(f"   Script set_env.py: {'✅' if test2_ok else '❌'}")
-    
+
     if test1_ok and test2_ok:
         print("\n🎉 ¡Todas las correcciones funcionan correctamente!")
         print("   El script setup.py debería ejecutarse sin tracebacks")
     else:
         print("\n❌ Hay problemas pendientes por resolver")
         return 1
-    
+
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
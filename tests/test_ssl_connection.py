@@ -1,73 +1,175 @@
 #!/usr/bin/env python3
+import asyncio
 import ssl
 import socket
-import httpx
+import struct
 import sys
 import warnings
 
+# httpx se importa recién en las pruebas que lo usan: arrastra h11/httpcore/
+# anyio/sniffio (~50 ms y varios MB), que sobran si la prueba SSL básica alcanza
+
+_HTTPX_CLIENT = None
+
+def _httpx_client():
+    """Cliente httpx compartido entre las pruebas.
+
+    Cerrar el cliente entre prueba y prueba tiraba el pool de conexiones y
+    obligaba a repetir el handshake TLS (~1 RTT + intercambio de claves) en
+    cada GET/POST; compartiendo uno solo se negocia una única vez.
+    """
+    global _HTTPX_CLIENT
+    if _HTTPX_CLIENT is None:
+        import httpx
+        _HTTPX_CLIENT = httpx.Client(
+            verify=False,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=4)
+        )
+    return _HTTPX_CLIENT
+
+def _basic_ctx():
+    """Contexto SSL por defecto sin verificación."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+def _version_ctx(version):
+    """Contexto SSL fijado a una versión TLS específica, sin verificación."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    context.minimum_version = version
+    context.maximum_version = version
+    return context
+
+# Matriz de configuraciones a probar, declarada una sola vez: cada entrada es
+# (nombre, fábrica de contexto, SNI) donde SNI None significa "usar hostname"
+# y '' deshabilita Server Name Indication
+_PROBES = (
+    ('SSL básico', _basic_ctx, None),
+    ('SSL sin SNI', _basic_ctx, ''),
+    ('TLSv1_2', lambda: _version_ctx(ssl.TLSVersion.TLSv1_2), None),
+    ('TLSv1_3', lambda: _version_ctx(ssl.TLSVersion.TLSv1_3), None),
+)
+
+async def _probe(addrs, context, server_hostname, timeout=15):
+    """Abre una conexión TLS con la configuración dada y devuelve (versión, cipher).
+
+    Recorre las direcciones resueltas en orden (como hace
+    socket.create_connection): en un host dual-stack con la primera
+    dirección rota —p. ej. IPv6 sin ruta— se cae a la siguiente.
+    """
+    loop = asyncio.get_running_loop()
+    sock = None
+    last_err = None
+    for family, sockaddr in addrs:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        # Varias conexiones cortas seguidas al mismo (host, 443): REUSEADDR +
+        # LINGER(1, 0) cierran con RST y evitan acumular sockets en TIME_WAIT,
+        # que en runners Windows con el rango efímero agotado estanca connect()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        sock.setblocking(False)
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, sockaddr), timeout=timeout)
+            break
+        except BaseException as e:
+            sock.close()
+            sock = None
+            last_err = e
+            if isinstance(e, (asyncio.CancelledError, KeyboardInterrupt)):
+                raise
+    if sock is None:
+        raise last_err
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(sock=sock, ssl=context,
+                                server_hostname=server_hostname),
+        timeout=timeout
+    )
+    ssl_obj = writer.get_extra_info('ssl_object')
+    version = ssl_obj.version() if ssl_obj else None
+    cipher = ssl_obj.cipher() if ssl_obj else None
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+    return version, cipher
+
+async def _run_ssl_probes(hostname, port):
+    """Corre las pruebas SSL de stdlib en paralelo y corta en el primer éxito.
+
+    Las configuraciones son independientes y están limitadas por I/O: en
+    secuencia el peor caso era la suma de los timeouts (~60s); en paralelo
+    colapsa al máximo de uno solo, y un éxito cancela el resto.
+    """
+    # DNS se resuelve una sola vez: las cuatro pruebas van al mismo destino,
+    # así que no tiene sentido pagar un getaddrinfo (10-50 ms) por cada una.
+    # Se conserva la lista completa: cada prueba recorre las direcciones en
+    # orden hasta conectar, igual que socket.create_connection
+    try:
+        addrs = [
+            (family, sockaddr)
+            for family, _, _, _, sockaddr
+            in socket.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+        ]
+    except socket.gaierror as e:
+        print(f"❌ Resolución DNS: FALLO - {e}")
+        return False
+
+    tasks = {
+        asyncio.ensure_future(
+            _probe(addrs, ctx_factory(),
+                   hostname if sni is None else sni)
+        ): name
+        for name, ctx_factory, sni in _PROBES
+    }
+
+    success = False
+    pending = set(tasks)
+    while pending and not success:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            name = tasks[task]
+            exc = task.exception()
+            if exc is None:
+                version, cipher = task.result()
+                print(f"✅ {name}: ÉXITO")
+                print(f"   Protocolo: {version}")
+                if cipher:
+                    print(f"   Cipher: {cipher}")
+                success = True
+            else:
+                print(f"❌ {name}: FALLO - {exc}")
+
+    # Un éxito alcanza: se cancelan las pruebas restantes
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    return success
+
 def test_ssl_connection(hostname, port=443):
     """Prueba diferentes configuraciones SSL"""
-    
+
     print(f"🔍 Probando conexión SSL a {hostname}:{port}")
-    
-    # Prueba 1: SSL básico sin verificación
-    print("\n1️⃣ Prueba SSL básico sin verificación...")
-    try:
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        
-        with socket.create_connection((hostname, port), timeout=15) as sock:
-            with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                print(f"✅ SSL básico: ÉXITO")
-                print(f"   Protocolo: {ssock.version()}")
-                print(f"   Cipher: {ssock.cipher()}")
-                return True
-    except Exception as e:
-        print(f"❌ SSL básico: FALLO - {e}")
-    
-    # Prueba 2: SSL sin SNI
-    print("\n2️⃣ Prueba SSL sin Server Name Indication (SNI)...")
-    try:
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        
-        with socket.create_connection((hostname, port), timeout=15) as sock:
-            with context.wrap_socket(sock) as ssock:  # Sin server_hostname
-                print(f"✅ SSL sin SNI: ÉXITO")
-                print(f"   Protocolo: {ssock.version()}")
-                return True
-    except Exception as e:
-        print(f"❌ SSL sin SNI: FALLO - {e}")
-    
-    # Prueba 3: SSL con TLS específicos
-    for version in [ssl.TLSVersion.TLSv1_2, ssl.TLSVersion.TLSv1_3]:
-        print(f"\n3️⃣ Prueba SSL con {version.name}...")
-        try:
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-            context.minimum_version = version
-            context.maximum_version = version
-            
-            with socket.create_connection((hostname, port), timeout=15) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    print(f"✅ {version.name}: ÉXITO")
-                    print(f"   Protocolo: {ssock.version()}")
-                    return True
-        except Exception as e:
-            print(f"❌ {version.name}: FALLO - {e}")
-    
+
+    # Pruebas 1-3: configuraciones stdlib en paralelo
+    print("\n⚡ Probando SSL básico, sin SNI, TLS 1.2 y TLS 1.3 en paralelo...")
+    if asyncio.run(_run_ssl_probes(hostname, port)):
+        return True
+
     # Prueba 4: HTTPX con diferentes configuraciones
     print(f"\n4️⃣ Prueba HTTPX sin verificación...")
     try:
         warnings.filterwarnings('ignore')
-        with httpx.Client(verify=False, timeout=15.0) as client:
-            response = client.get(f'https://{hostname}/api')
-            print(f"✅ HTTPX básico: ÉXITO - Status {response.status_code}")
-            print(f"   Headers: {dict(list(response.headers.items())[:3])}")
-            return True
+        client = _httpx_client()
+        response = client.get(f'https://{hostname}/api', timeout=15.0)
+        print(f"✅ HTTPX básico: ÉXITO - Status {response.status_code}")
+        print(f"   Headers: {dict(list(response.headers.items())[:3])}")
+        return True
     except Exception as e:
         print(f"❌ HTTPX básico: FALLO - {e}")
     
@@ -77,26 +179,36 @@ def test_ssl_connection(hostname, port=443):
 def test_login_endpoint(hostname, port=443):
     """Prueba el endpoint de login específicamente"""
     print(f"\n🔐 Probando endpoint de login...")
-    
+
     try:
+        import httpx
         warnings.filterwarnings('ignore')
-        with httpx.Client(verify=False, timeout=30.0) as client:
-            # Primero probamos GET al /api
-            print("📡 GET /api...")
-            response = client.get(f'https://{hostname}/api')
-            print(f"   Status: {response.status_code}")
-            
-            # Luego probamos POST al /login
-            print("📡 POST /api/login...")
-            login_data = {
-                "usuario": "test",
-                "password": "test"
-            }
-            response = client.post(f'https://{hostname}/api/login', json=login_data)
-            print(f"   Status: {response.status_code}")
-            print(f"   Response: {response.text[:200]}...")
-            
-            return True
+        # Reutiliza la conexión que la prueba HTTPX anterior pudo dejar viva
+        client = _httpx_client()
+
+        # Primero probamos GET al /api
+        print("📡 GET /api...")
+        response = client.get(f'https://{hostname}/api')
+        print(f"   Status: {response.status_code}")
+
+        # Con el servidor caído el POST solo sumaría otro timeout completo
+        if response.status_code >= 500:
+            print("⚠️ Servidor con problemas, omitiendo prueba de login")
+            return False
+
+        # Luego probamos POST al /login; un login no debería tardar 30s de
+        # lectura, así que falla rápido con timeouts más agresivos
+        print("📡 POST /api/login...")
+        login_data = {
+            "usuario": "test",
+            "password": "test"
+        }
+        response = client.post(f'https://{hostname}/api/login', json=login_data,
+                               timeout=httpx.Timeout(30.0, connect=5.0, read=10.0))
+        print(f"   Status: {response.status_code}")
+        print(f"   Response: {response.text[:200]}...")
+
+        return True
     except Exception as e:
         print(f"❌ Endpoint login: FALLO - {e}")
         return False
@@ -32,37 +32,59 @@ from typing import Optional, List
 import re
 from datetime import datetime
 
+# Patrones de fecha precompilados: parse_cert_date corre una vez por archivo
+# del directorio y re.search con el patrón literal pagaba el lookup del cache
+# de re en cada llamada
+_DATE8_RE = re.compile(r'(\d{8})')
+_DATEISO_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+# Extensiones reconocidas como certificado
+_CERT_SUFFIXES = frozenset({'.pem', '.crt', '.cert'})
+
 class CertificateManager:
     """Gestor de certificados SSL para el cliente SSN."""
     
     def __init__(self):
         self.logger = logging.getLogger('cert_utils')
         self.base_path = Path(__file__).resolve().parents[2]  # Ir dos niveles arriba desde upload/lib/
-        
+        # Caches perezosos: las variables de entorno no cambian en runtime,
+        # pero el .env puede cargarse después de instanciar el manager (la
+        # instancia global se crea al importar), así que se resuelven recién
+        # en el primer acceso y de ahí en más se reutilizan
+        self._cert_dir = None
+        self._auto_detect = None
+
     def get_cert_directory(self) -> Path:
         """Obtiene el directorio de certificados desde la configuración."""
-        cert_dir = os.getenv('SSL_CERT_DIR', 'upload/certs')
-        return self.base_path / cert_dir
-    
+        if self._cert_dir is None:
+            self._cert_dir = self.base_path / os.getenv('SSL_CERT_DIR', 'upload/certs')
+        return self._cert_dir
+
     def is_auto_detect_enabled(self) -> bool:
         """Verifica si la detección automática está habilitada."""
-        return os.getenv('SSL_CERT_AUTO_DETECT', 'true').lower() == 'true'
+        if self._auto_detect is None:
+            self._auto_detect = os.getenv('SSL_CERT_AUTO_DETECT', 'true').lower() == 'true'
+        return self._auto_detect
     
     def find_cert_files(self) -> List[Path]:
         """Busca archivos de certificado en el directorio configurado."""
         cert_dir = self.get_cert_directory()
-        
-        if not cert_dir.exists():
+
+        # Una sola pasada con os.scandir en lugar de un glob por extensión:
+        # cada pathlib.glob rearma sus selectores, recompila el fnmatch y
+        # relee el directorio completo. El try/except cubre además el caso
+        # de directorio inexistente sin el stat extra de exists()
+        try:
+            with os.scandir(cert_dir) as entries:
+                cert_files = [
+                    Path(entry.path) for entry in entries
+                    if '.' + entry.name.rpartition('.')[2] in _CERT_SUFFIXES
+                    and entry.is_file()
+                ]
+        except OSError:
             self.logger.warning(f"Directorio de certificados no existe: {cert_dir}")
             return []
-        
-        # Patrones comunes para archivos de certificado
-        patterns = ['*.pem', '*.crt', '*.cert']
-        cert_files = []
-        
-        for pattern in patterns:
-            cert_files.extend(cert_dir.glob(pattern))
-        
+
         # Filtrar archivos que contengan "ssn" en el nombre
         ssn_certs = [f for f in cert_files if 'ssn' in f.name.lower()]
         
@@ -74,7 +96,7 @@ class CertificateManager:
     def parse_cert_date(self, filename: str) -> Optional[datetime]:
         """Extrae fecha del nombre del archivo de certificado."""
         # Buscar patrones como ssn_cert_20250904.pem
-        date_match = re.search(r'(\d{8})', filename)
+        date_match = _DATE8_RE.search(filename)
         if date_match:
             try:
                 date_str = date_match.group(1)
@@ -83,7 +105,7 @@ class CertificateManager:
                 pass
         
         # Buscar patrones como ssn_cert_2025-09-04.pem
-        date_match = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
+        date_match = _DATEISO_RE.search(filename)
         if date_match:
             try:
                 date_str = date_match.group(1)
@@ -116,33 +138,28 @@ class CertificateManager:
         if not env_certs:
             env_certs = cert_files
         
-        # Ordenar por fecha si es posible, sino por nombre
-        cert_with_dates = []
-        cert_without_dates = []
-        
+        # Selección en una sola pasada: de los dos sorts descendentes solo se
+        # usaba el elemento [0], así que basta un máximo O(N) sin las listas
+        # intermedias ni el O(N log N) del ordenamiento
+        best_dated = None      # (fecha, archivo) más reciente
+        best_undated = None    # mayor nombre entre los sin fecha
         for cert_file in env_certs:
             cert_date = self.parse_cert_date(cert_file.name)
             if cert_date:
-                cert_with_dates.append((cert_file, cert_date))
-            else:
-                cert_without_dates.append(cert_file)
-        
-        # Ordenar certificados con fecha por fecha descendente (más reciente primero)
-        cert_with_dates.sort(key=lambda x: x[1], reverse=True)
-        
-        # Ordenar certificados sin fecha por nombre descendente
-        cert_without_dates.sort(key=lambda x: x.name, reverse=True)
-        
+                if best_dated is None or cert_date > best_dated[0]:
+                    best_dated = (cert_date, cert_file)
+            elif best_undated is None or cert_file.name > best_undated.name:
+                best_undated = cert_file
+
         # Priorizar certificados con fecha
-        if cert_with_dates:
-            selected_cert = cert_with_dates[0][0]
+        if best_dated:
+            selected_cert = best_dated[1]
             self.logger.debug(f"Certificado seleccionado (con fecha): {selected_cert.name}")
             return selected_cert.name
-        elif cert_without_dates:
-            selected_cert = cert_without_dates[0]
-            self.logger.debug(f"Certificado seleccionado (sin fecha): {selected_cert.name}")
-            return selected_cert.name
-        
+        elif best_undated:
+            self.logger.debug(f"Certificado seleccionado (sin fecha): {best_undated.name}")
+            return best_undated.name
+
         return None
     
     def get_full_cert_path(self, cert_filename: str) -> str:
@@ -152,14 +169,29 @@ class CertificateManager:
     
     def validate_cert_file(self, cert_path: str) -> bool:
         """Valida que un archivo de certificado sea válido."""
+        # Lectura binaria por bloques con corte temprano: alcanza con hallar
+        # los dos marcadores, sin decodificar ni cargar el archivo entero (un
+        # bundle multi-certificado puede medir megabytes). El solapamiento
+        # (tail) cubre marcadores partidos entre bloques
+        begin = b'-----BEGIN CERTIFICATE-----'
+        end = b'-----END CERTIFICATE-----'
+        found_begin = found_end = False
+        tail = b''
         try:
-            if not os.path.exists(cert_path):
-                return False
-            
-            # Leer el archivo y verificar que tenga el formato básico de certificado
-            with open(cert_path, 'r') as f:
-                content = f.read()
-                return '-----BEGIN CERTIFICATE-----' in content and '-----END CERTIFICATE-----' in content
+            with open(cert_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(65536), b''):
+                    window = tail + chunk
+                    if not found_begin and begin in window:
+                        found_begin = True
+                    if not found_end and end in window:
+                        found_end = True
+                    if found_begin and found_end:
+                        return True
+                    tail = window[-(len(begin) - 1):]
+            return False
+        except OSError:
+            # Archivo inexistente o ilegible: no es un certificado válido
+            return False
         except Exception as e:
             self.logger.error(f"Error validando certificado {cert_path}: {e}")
             return False
@@ -173,14 +205,21 @@ class CertificateManager:
             'size': 0
         }
         
+        # Un único os.stat responde existencia y tamaño a la vez (exists +
+        # getsize eran dos stat independientes); validate_cert_file ya no
+        # re-chequea existencia, su open fallido devuelve False
         try:
-            if os.path.exists(cert_path):
-                info['exists'] = True
-                info['size'] = os.path.getsize(cert_path)
-                info['valid_format'] = self.validate_cert_file(cert_path)
+            st = os.stat(cert_path)
+        except OSError:
+            return info
         except Exception as e:
             self.logger.error(f"Error obteniendo información del certificado: {e}")
-        
+            return info
+
+        info['exists'] = True
+        info['size'] = st.st_size
+        info['valid_format'] = self.validate_cert_file(cert_path)
+
         return info
     
     def list_available_certs(self) -> List[dict]:
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilidades compartidas por los scripts de carga a la SSN.
+
+Concentra el código que estaba duplicado entre ssn-mensual.py y
+ssn-semanal.py: la configuración de consola en Windows, los cuadros de
+error/éxito, el cliente SSN compartido por operación y la carga de archivos
+JSON. Con una sola copia, cada optimización (y cada corrección) se aplica en
+un único lugar y el warmup de imports se paga una sola vez.
+
+Autor: G. Casanova
+Fecha: Septiembre 2025
+"""
+
+import sys
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import orjson  # opcional: parser JSON en C, mucho más rápido
+except ImportError:
+    orjson = None
+
+def configure_windows_console():
+    """Configura la consola para UTF-8 en Windows (sin efecto en otros SO)."""
+    # (sys.platform es una constante: no paga el uname()/registro de platform.system())
+    if sys.platform != 'win32':
+        return
+    # Forzar UTF-8 para stdout y stderr
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    # Configurar la consola para UTF-8 sin spawnear cmd.exe (chcp):
+    # una llamada directa a kernel32 hace lo mismo en el propio proceso
+    try:
+        import ctypes
+        ctypes.windll.kernel32.SetConsoleOutputCP(65001)
+        ctypes.windll.kernel32.SetConsoleCP(65001)
+    except (OSError, AttributeError):
+        pass
+
+def show_error_message(error_message):
+    """Muestra un mensaje de error destacado y bien formateado."""
+    print("\n" + "="*80)
+    print("|| ⛔ ERROR:")
+    print("||")
+    # Dividir el mensaje en líneas para ajustar al ancho
+    for line in error_message.split('\n'):
+        if line.strip():
+            # Dividir líneas muy largas
+            while len(line) > 74:  # 80 - 4 (para "|| ") - 2 (margen)
+                print(f"|| {line[:74]}")
+                line = line[74:]
+            if line:
+                print(f"|| {line}")
+        else:
+            print("||")
+    print("||")
+    print("="*80)
+    print()  # Línea adicional después del cuadro de error
+
+def show_success_message(message="Operación completada exitosamente!"):
+    """Muestra un mensaje de éxito destacado y bien formateado."""
+    print("\n" + "="*80)
+    print("|| ✅ ÉXITO:")
+    print("||")
+    print(f"|| {message}")
+    print("||")
+    print("="*80)
+    print()  # Línea adicional después del cuadro de éxito
+
+@contextmanager
+def client_for(config, client=None, debug=None):
+    """Devuelve el cliente compartido (sin cerrarlo) o crea uno temporal.
+
+    Cada SSNClient paga la construcción del contexto SSL y un handshake TLS
+    propio; reutilizar el cliente de main() evita repetir ese costo en cada
+    operación y en cada reintento, y las funciones siguen siendo usables de
+    forma suelta.
+    """
+    if client is not None:
+        yield client
+    else:
+        from .ssn_client import SSNClient
+        if debug is None:
+            debug = config.get('debug', False)
+        with SSNClient(config, debug=debug) as c:
+            yield c
+
+def load_json_file(path):
+    """Lee y parsea un archivo JSON en una sola pasada sobre bytes.
+
+    El scanner C de json (u orjson, si está instalado) opera directo sobre
+    los bytes, sin la pasada de decodificación incremental del TextIOWrapper
+    (visible en archivos de varios MB).
+    """
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
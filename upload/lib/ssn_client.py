@@ -46,22 +46,83 @@ Autor: G. Casanova
 Fecha: Septiembre 2025
 """
 
-import os
+import atexit
 import os
 import json
 import httpx
 import certifi
+import socket
 import ssl
+from urllib.parse import urlparse
 from typing import Dict, Any, Optional, Union
 from urllib3.exceptions import InsecureRequestWarning
 import warnings
 import logging
 from pathlib import Path
 
+try:
+    import orjson  # opcional: parser/serializador JSON en C, mucho más rápido
+except ImportError:
+    orjson = None
+
+# Ruta del bundle de certifi, resuelta una única vez al cargar el módulo:
+# certifi.where() repite su lógica de resolución de paths en cada llamada
+_CERTIFI_PATH = certifi.where()
+
+def _body_snippet(response, limit: int = 1000) -> str:
+    """Primeros bytes del body decodificados, para logs y mensajes de error.
+
+    Decodificar solo el recorte de response.content evita materializar el
+    texto completo (response.text decodifica todo el body) cuando la
+    respuesta es grande y solo se necesita un extracto.
+    """
+    raw = response.content
+    snippet = raw[:limit].decode('utf-8', errors='replace')
+    return snippet + '...' if len(raw) > limit else snippet
+
+def _json_body_kwargs(data):
+    """Arma los kwargs del body JSON para httpx, usando orjson si está disponible.
+
+    Con orjson el payload se serializa una sola vez directo a bytes; el camino
+    json= de httpx pasa por json.dumps a str y un encode UTF-8 adicional.
+    """
+    if orjson is not None:
+        return {'content': orjson.dumps(data)}
+    return {'json': data}
+
+_login_kwargs_cache = None
+
+def _login_body_kwargs():
+    """Kwargs del body de login, armados y serializados una sola vez por proceso.
+
+    Las credenciales vienen del entorno y no cambian durante la ejecución;
+    cachear el payload ya serializado evita releer el entorno y volver a
+    serializar el JSON en cada autenticación (reintentos, múltiples clientes).
+    """
+    global _login_kwargs_cache
+    if _login_kwargs_cache is None:
+        user = os.getenv('SSN_USER')
+        password = os.getenv('SSN_PASSWORD')
+        company = os.getenv('SSN_COMPANY')
+
+        if not all([user, password, company]):
+            raise RuntimeError("Faltan variables de entorno SSN_USER, SSN_PASSWORD o SSN_COMPANY")
+
+        _login_kwargs_cache = _json_body_kwargs({
+            "USER": user,
+            "CIA": company,
+            "PASSWORD": password
+        })
+    return _login_kwargs_cache
+
 class SSNClient:
     # Variable de clase para controlar mensajes SSL duplicados
     _ssl_messages_shown = False
     _auth_messages_shown = False
+    # Contextos SSL estrictos compartidos entre instancias, por ambiente
+    _ssl_context_cache = {}
+    # Transportes HTTP (pools de conexiones) compartidos entre instancias
+    _transports = {}
     
     def __init__(self, config: Dict[str, Any], debug: bool = False):
         """
@@ -89,89 +150,52 @@ class SSNClient:
         if self.config.get('ssl', {}).get('verify', True):
             # Configuración SSL estricta (verificación habilitada)
             try:
-                # Crear contexto SSL con certificados del sistema y certifi
-                ssl_context = ssl.create_default_context()
-                ssl_context.load_default_certs()
-                # Cargar certificados de certifi
-                ssl_context.load_verify_locations(cafile=certifi.where())
-                
-                # Cargar certificado específico de la SSN desde .env
-                try:
-                    from .cert_utils import cert_manager
-                    current_env = self.config.get('environment', 'prod')
-                    cert_path = cert_manager.get_latest_cert_for_environment(current_env)
-                    
-                    if cert_path:
-                        ca_file_full = cert_manager.get_full_cert_path(cert_path)
-                        if os.path.exists(ca_file_full):
-                            ssl_context.load_verify_locations(cafile=ca_file_full)
-                            if not self.debug and not SSNClient._ssl_messages_shown:
-                                print("🔐 Certificados de seguridad SSN cargados correctamente")
-                            elif self.debug:
-                                self.logger.info(f"Cargado certificado específico: {ca_file_full}")
-                        else:
-                            self.logger.warning(f"No se encontró el archivo de certificado: {ca_file_full}")
-                    else:
-                        self.logger.warning("No se pudo obtener ruta del certificado desde configuración .env")
-                except ImportError:
-                    self.logger.warning("cert_utils no disponible, usando solo certificados del sistema")
-                except Exception as e:
-                    self.logger.warning(f"Error cargando certificado desde .env: {e}")
-                
-                # Configurar nivel de seguridad para producción
-                ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
-                ssl_context.verify_mode = ssl.CERT_REQUIRED
-                ssl_context.check_hostname = True
-                
-                # Mostramos información del certificado para diagnóstico
+                # Contexto compartido entre instancias (ver _get_ssl_context)
+                ssl_context = self._get_ssl_context()
+
+                # Mostramos información del certificado para diagnóstico,
+                # directo del contexto de stdlib (sin pyOpenSSL, cuyo import
+                # arrastra todo el stack de cryptography/cffi)
                 if self.debug:
-                    from OpenSSL import SSL
-                    ctx = SSL.Context(SSL.TLS_METHOD)
-                    ctx.load_verify_locations(cafile=certifi.where())
                     self.logger.debug("🔧 Configuración SSL:")
-                    self.logger.debug(f"📁 Certificados cargados de: {certifi.where()}")
-                    self.logger.debug(f"🔒 Versión mínima TLS: 1.2")
-                    self.logger.debug(f"✅ Modo de verificación: CERT_REQUIRED")
-                    self.logger.debug(f"🌐 Verificación de hostname: Activada")
+                    self.logger.debug(f"📁 Certificados cargados de: {_CERTIFI_PATH}")
+                    self.logger.debug(f"🔒 Versión mínima TLS: {ssl_context.minimum_version.name}")
+                    self.logger.debug(f"✅ Modo de verificación: {ssl_context.verify_mode.name}")
+                    self.logger.debug(f"🌐 Verificación de hostname: {'Activada' if ssl_context.check_hostname else 'Desactivada'}")
                 elif not SSNClient._ssl_messages_shown:
                     print("🔒 Configurando conexión segura SSL/TLS...")
                 
-                # Hacemos una prueba de conexión
-                test_client = httpx.Client(
-                    verify=ssl_context,
-                    timeout=5.0  # timeout corto para la prueba
-                )
-                
-                try:
-                    response = test_client.get(self.config['baseUrl'])
-                    # Intentar obtener información del certificado
+                # Prueba de conexión opcional (ssl.probe en la config): un
+                # handshake TCP+TLS valida certificado y hostname por
+                # adelantado, pero cuesta un round-trip completo en cada
+                # arranque; por defecto se omite y la verificación ocurre
+                # con la primera petición real
+                if self.config.get('ssl', {}).get('probe', False):
+                    host = urlparse(self.config['baseUrl']).hostname
                     try:
-                        cert = response.extensions.get_ssl_context()
-                        if cert and self.debug:
-                            self.logger.debug(f"Conexión establecida con:")
-                            self.logger.debug(f"Protocolo: {cert.protocol if hasattr(cert, 'protocol') else 'N/A'}")
-                            self.logger.debug(f"Cipher: {cert.cipher() if hasattr(cert, 'cipher') else 'N/A'}")
-                    except Exception:
-                        pass  # No es crítico si no podemos obtener esta información
-                    
-                except httpx.ConnectError as conn_err:
-                    if "SSL" in str(conn_err) or "certificate" in str(conn_err).lower():
+                        with socket.create_connection((host, 443), timeout=5.0) as sock:
+                            with ssl_context.wrap_socket(sock, server_hostname=host) as ssock:
+                                if self.debug:
+                                    self.logger.debug(f"Conexión establecida con:")
+                                    self.logger.debug(f"Protocolo: {ssock.version()}")
+                                    self.logger.debug(f"Cipher: {ssock.cipher()}")
+                    except ssl.SSLError as conn_err:
                         self.logger.error(f"Error de verificación SSL: {str(conn_err)}")
                         raise
-                    else:
+                    except OSError as conn_err:
                         raise RuntimeError(f"Error de conexión: {str(conn_err)}")
-                finally:
-                    test_client.close()
-                
-                # Si llegamos aquí, la verificación SSL fue exitosa
+
+                    # Si llegamos aquí, la verificación SSL fue exitosa
+                    if not self.debug and not SSNClient._ssl_messages_shown:
+                        print("✅ Conexión SSL verificada correctamente")
+                    elif self.debug:
+                        self.logger.info("Conexión SSL verificada correctamente")
+
                 self.verify = True
                 self.ssl_context = ssl_context
-                if not self.debug and not SSNClient._ssl_messages_shown:
-                    print("✅ Conexión SSL verificada correctamente")
-                    SSNClient._ssl_messages_shown = True
-                elif self.debug:
-                    self.logger.info("Conexión SSL verificada correctamente")
-                    
+                SSNClient._ssl_messages_shown = True
+
+
             except Exception as e:
                 error_msg = f"Error crítico en la configuración SSL: {str(e)}"
                 self.logger.error(error_msg)
@@ -199,8 +223,24 @@ class SSNClient:
         if self.debug:
             self.logger.debug(f"Creando cliente HTTP con verify={self.ssl_context}, timeout={timeout}")
         
+        # El transporte (pool de conexiones) se comparte entre todas las
+        # instancias con la misma baseUrl y verificación: el handshake TLS,
+        # el slow-start de TCP y el DNS se pagan una sola vez por proceso.
+        # HTTP/2 multiplexa login y envío de datos sobre esa única conexión;
+        # requiere el paquete opcional h2 (httpx[http2])
+        transport_key = (self.config['baseUrl'], self.verify,
+                         self.config.get('environment', 'prod'))
+        transport = SSNClient._transports.get(transport_key)
+        if transport is None:
+            try:
+                transport = httpx.HTTPTransport(verify=self.ssl_context, http2=True)
+            except ImportError:
+                # h2 no instalado: seguimos con HTTP/1.1 + keep-alive
+                transport = httpx.HTTPTransport(verify=self.ssl_context)
+            SSNClient._transports[transport_key] = transport
+
         self.client = httpx.Client(
-            verify=self.ssl_context,
+            transport=transport,
             timeout=timeout,
             headers={"Content-Type": "application/json"}
         )
@@ -208,6 +248,73 @@ class SSNClient:
         if self.debug:
             self.logger.debug("Cliente HTTP creado exitosamente")
     
+    @property
+    def token(self):
+        """Token de autenticación vigente."""
+        return self._token
+
+    @token.setter
+    def token(self, value):
+        # Mantiene el header de sesión sincronizado también cuando el token
+        # se asigna desde afuera (los scripts hacen client.token = token al
+        # reutilizar un cliente compartido); sin esto la petición saldría
+        # sin autenticar. En __init__ el cliente HTTP todavía no existe
+        self._token = value
+        client = getattr(self, 'client', None)
+        if client is not None:
+            if value:
+                client.headers["Token"] = value
+            else:
+                client.headers.pop("Token", None)
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """Construye (o reutiliza) el contexto SSL estricto del ambiente.
+
+        El contexto se cachea por ambiente a nivel de clase y se comparte
+        entre instancias: load_default_certs más el bundle de certifi parsean
+        decenas de ms de certificados que no cambian durante el proceso.
+        """
+        current_env = self.config.get('environment', 'prod')
+        cached = SSNClient._ssl_context_cache.get(current_env)
+        if cached is not None:
+            return cached
+
+        # Crear contexto SSL con certificados del sistema y certifi
+        ssl_context = ssl.create_default_context()
+        ssl_context.load_default_certs()
+        # Cargar certificados de certifi
+        ssl_context.load_verify_locations(cafile=_CERTIFI_PATH)
+
+        # Cargar certificado específico de la SSN desde .env
+        try:
+            from .cert_utils import cert_manager
+            cert_path = cert_manager.get_latest_cert_for_environment(current_env)
+
+            if cert_path:
+                ca_file_full = cert_manager.get_full_cert_path(cert_path)
+                if os.path.exists(ca_file_full):
+                    ssl_context.load_verify_locations(cafile=ca_file_full)
+                    if not self.debug and not SSNClient._ssl_messages_shown:
+                        print("🔐 Certificados de seguridad SSN cargados correctamente")
+                    elif self.debug:
+                        self.logger.info(f"Cargado certificado específico: {ca_file_full}")
+                else:
+                    self.logger.warning(f"No se encontró el archivo de certificado: {ca_file_full}")
+            else:
+                self.logger.warning("No se pudo obtener ruta del certificado desde configuración .env")
+        except ImportError:
+            self.logger.warning("cert_utils no disponible, usando solo certificados del sistema")
+        except Exception as e:
+            self.logger.warning(f"Error cargando certificado desde .env: {e}")
+
+        # Configurar nivel de seguridad para producción
+        ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+        ssl_context.verify_mode = ssl.CERT_REQUIRED
+        ssl_context.check_hostname = True
+
+        SSNClient._ssl_context_cache[current_env] = ssl_context
+        return ssl_context
+
     def _setup_logging(self):
         """Configura el sistema de logging."""
         self.logger = logging.getLogger('ssn_client')
@@ -252,63 +359,65 @@ class SSNClient:
         Raises:
             RuntimeError si hay errores en la respuesta
         """
-        try:
-            # Solo loguear detalles en modo debug
-            if self.debug:
-                self.logger.debug(f"Response Code: {response.status_code}")
-                if response.status_code != 200:
-                    self.logger.debug(f"Response Headers: {dict(response.headers)}")
-                    self.logger.debug(f"Response Body: {response.text[:1000]}...")
-            
-            if response.status_code == 401:
-                raise RuntimeError("Error de autenticación. Token inválido o expirado.")
-            
-            data = response.json()
-            
+        # Solo loguear detalles en modo debug
+        if self.debug:
+            self.logger.debug(f"Response Code: {response.status_code}")
             if response.status_code != 200:
-                # Construir mensaje de error más completo
-                error_parts = []
-                
-                # Agregar mensaje principal si existe
-                if data.get("message"):
-                    error_parts.append(data["message"])
-                
-                # Agregar errores específicos si existen
-                # Buscar tanto "errors" (inglés) como "errores" (español)
-                # Solo considerar campos que sean arrays o strings, no objetos complejos
-                errores = None
-                for field in ["errors", "errores"]:
-                    field_value = data.get(field)
-                    if field_value and (isinstance(field_value, (list, str))):
-                        errores = field_value
-                        break
-                
-                if errores:
-                    if isinstance(errores, list):
-                        for error in errores:
-                            error_parts.append(f"  • {error}")
-                    else:
-                        error_parts.append(f"  • {errores}")
-                
-                # Si no hay mensaje estructurado, usar campos alternativos
-                if not error_parts:
-                    error_msg = (
-                        data.get("detail") or
-                        response.text
-                    )
-                    if isinstance(error_msg, (list, dict)):
-                        error_msg = json.dumps(error_msg, indent=2, ensure_ascii=False)
-                    error_parts.append(error_msg)
-                
-                full_error_msg = "\n".join(error_parts)
-                raise RuntimeError(f"Error en {context}: {full_error_msg}")
-                
-            return data
-            
+                self.logger.debug(f"Response Headers: {dict(response.headers)}")
+                self.logger.debug(f"Response Body: {_body_snippet(response)}")
+
+        if response.status_code == 401:
+            raise RuntimeError("Error de autenticación. Token inválido o expirado.")
+
+        # Solo el parseo JSON es realmente propenso a excepciones; el resto del
+        # camino queda lineal, fuera de la maquinaria de try/except (que además
+        # re-envolvía sus propios RuntimeError como "Error procesando respuesta")
+        try:
+            # orjson parsea los bytes crudos de la respuesta sin pasar por el
+            # wrapper de stdlib de httpx
+            data = orjson.loads(response.content) if orjson is not None else response.json()
         except json.JSONDecodeError:
-            raise RuntimeError(f"Error decodificando respuesta JSON: {response.text}")
-        except Exception as e:
-            raise RuntimeError(f"Error procesando respuesta: {str(e)}")
+            raise RuntimeError(f"Error decodificando respuesta JSON: {_body_snippet(response)}")
+
+        if response.status_code != 200:
+            # Construir mensaje de error más completo
+            error_parts = []
+
+            # Agregar mensaje principal si existe
+            if data.get("message"):
+                error_parts.append(data["message"])
+
+            # Agregar errores específicos si existen
+            # Buscar tanto "errors" (inglés) como "errores" (español)
+            # Solo considerar campos que sean arrays o strings, no objetos complejos
+            errores = None
+            for field in ["errors", "errores"]:
+                field_value = data.get(field)
+                if field_value and (isinstance(field_value, (list, str))):
+                    errores = field_value
+                    break
+
+            if errores:
+                if isinstance(errores, list):
+                    for error in errores:
+                        error_parts.append(f"  • {error}")
+                else:
+                    error_parts.append(f"  • {errores}")
+
+            # Si no hay mensaje estructurado, usar campos alternativos
+            if not error_parts:
+                error_msg = (
+                    data.get("detail") or
+                    response.text
+                )
+                if isinstance(error_msg, (list, dict)):
+                    error_msg = json.dumps(error_msg, indent=2, ensure_ascii=False)
+                error_parts.append(error_msg)
+
+            full_error_msg = "\n".join(error_parts)
+            raise RuntimeError(f"Error en {context}: {full_error_msg}")
+
+        return data
     
     def authenticate(self) -> str:
         """
@@ -320,20 +429,8 @@ class SSNClient:
         Raises:
             RuntimeError si hay error de autenticación
         """
-        user = os.getenv('SSN_USER')
-        password = os.getenv('SSN_PASSWORD')
-        company = os.getenv('SSN_COMPANY')
-        
-        if not all([user, password, company]):
-            raise RuntimeError("Faltan variables de entorno SSN_USER, SSN_PASSWORD o SSN_COMPANY")
-        
         url = self._build_url("authenticate")  # usamos authenticate aunque el endpoint sea login
-        payload = {
-            "USER": user,
-            "CIA": company,
-            "PASSWORD": password
-        }
-        
+
         try:
             if not self.debug and not SSNClient._auth_messages_shown:
                 print("🔑 Autenticando con la SSN...")
@@ -342,7 +439,7 @@ class SSNClient:
                 self.logger.debug(f"Autenticando en {url}")
                 self.logger.debug(f"Verificación SSL: {'Activada' if self.verify else 'Desactivada'}")
             
-            response = self.client.post(url, json=payload)
+            response = self.client.post(url, **_login_body_kwargs())
             data = self._handle_response(response, "autenticación")
             
             token = data.get('TOKEN') or data.get('token')
@@ -352,6 +449,8 @@ class SSNClient:
             if not self.debug and SSNClient._auth_messages_shown:
                 print("✅ Autenticación exitosa")
             
+            # El setter de token lo instala en los headers de la sesión: las
+            # peticiones siguientes no rearman el dict por llamada
             self.token = token
             return token
             
@@ -368,10 +467,9 @@ class SSNClient:
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Realiza una petición GET."""
         url = self._build_url(endpoint)
-        headers = {"Token": self.token} if self.token else {}
-        
+
         try:
-            response = self.client.get(url, params=params, headers=headers)
+            response = self.client.get(url, params=params)
             return self._handle_response(response, f"GET {endpoint}")
         except httpx.RequestError as e:
             raise RuntimeError(f"Error en GET {endpoint}: {str(e)}")
@@ -379,15 +477,15 @@ class SSNClient:
     def post(self, endpoint: str, data: Dict) -> Dict[str, Any]:
         """Realiza una petición POST."""
         url = self._build_url(endpoint)
-        headers = {"Token": self.token} if self.token else {}
-        
+
         if self.debug:
             self.logger.debug(f"POST {url}")
-            self.logger.debug(f"Headers: {headers}")
+            # No se loguea el valor del token, solo su presencia
+            self.logger.debug(f"Token header: {'presente' if self.token else 'ausente'}")
             self.logger.debug(f"Data: {json.dumps(data, indent=2)}")
-        
+
         try:
-            response = self.client.post(url, json=data, headers=headers)
+            response = self.client.post(url, **_json_body_kwargs(data))
             return self._handle_response(response, f"POST {endpoint}")
         except httpx.RequestError as e:
             raise RuntimeError(f"Error en POST {endpoint}: {str(e)}")
@@ -395,16 +493,27 @@ class SSNClient:
     def put(self, endpoint: str, data: Dict) -> Dict[str, Any]:
         """Realiza una petición PUT."""
         url = self._build_url(endpoint)
-        headers = {"Token": self.token} if self.token else {}
-        
+
         try:
-            response = self.client.put(url, json=data, headers=headers)
+            response = self.client.put(url, **_json_body_kwargs(data))
             return self._handle_response(response, f"PUT {endpoint}")
         except httpx.RequestError as e:
             raise RuntimeError(f"Error en PUT {endpoint}: {str(e)}")
     
     def __enter__(self):
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.client.close()
+        # No se cierra el cliente: cerrarlo cerraría el transporte compartido
+        # y las demás instancias del proceso perderían sus conexiones vivas.
+        # _close_transports (atexit) hace el cierre final al terminar
+        pass
+
+@atexit.register
+def _close_transports():
+    """Cierra los pools de conexiones compartidos al terminar el proceso."""
+    for transport in SSNClient._transports.values():
+        try:
+            transport.close()
+        except Exception:
+            pass
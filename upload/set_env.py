@@ -1,7 +1,6 @@
 import sys
 import json
 import os
-import shutil
 from pathlib import Path
 from dotenv import load_dotenv
 from lib.cert_utils import cert_manager
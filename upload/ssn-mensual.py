@@ -50,61 +50,20 @@ Fecha: Septiembre 2025
 """
 
 import os
-import sys
-import platform
-
-# Configurar la codificación para sistemas Windows
-if platform.system() == "Windows":
-    # Forzar UTF-8 para stdout y stderr
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-    # Configurar la consola para UTF-8 si es posible
-    try:
-        os.system('chcp 65001 >nul 2>&1')
-    except:
-        pass
-
 import sys
 import json
-import os
 import argparse
-import shutil
 from dotenv import load_dotenv
 from pathlib import Path
 import re
 from datetime import datetime
 from lib.ssn_client import SSNClient  # TODO: Actualizar a ssn-client en v2.0
+# Código antes duplicado entre los scripts de carga, ahora compartido en lib
+from lib.script_utils import (configure_windows_console, show_error_message,
+                              show_success_message, client_for, load_json_file)
 
-def show_error_message(error_message):
-    """Muestra un mensaje de error destacado y bien formateado."""
-    print("\n" + "="*80)
-    print("|| ⛔ ERROR:")
-    print("||")
-    # Dividir el mensaje en líneas para ajustar al ancho
-    for line in error_message.split('\n'):
-        if line.strip():
-            # Dividir líneas muy largas
-            while len(line) > 74:  # 80 - 4 (para "|| ") - 2 (margen)
-                print(f"|| {line[:74]}")
-                line = line[74:]
-            if line:
-                print(f"|| {line}")
-        else:
-            print("||")
-    print("||")
-    print("="*80)
-    print()  # Línea adicional después del cuadro de error
-
-def show_success_message(message="Operación completada exitosamente!"):
-    """Muestra un mensaje de éxito destacado y bien formateado."""
-    print("\n" + "="*80)
-    print("|| ✅ ÉXITO:")
-    print("||")
-    print(f"|| {message}")
-    print("||")
-    print("="*80)
-    print()  # Línea adicional después del cuadro de éxito
+# Configurar la codificación para sistemas Windows
+configure_windows_console()
 
 env_path = Path(__file__).resolve().parents[1] / '.env'
 load_dotenv(dotenv_path=env_path)
@@ -171,16 +130,16 @@ def show_startup_banner(config):
     print(f"📅 Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
     print("-" * 60)
 
-def authenticate(config):
+def authenticate(config, client=None):
     """Autentica con el servicio SSN usando el cliente HTTP."""
     try:
-        with SSNClient(config, debug=config.get('debug', False)) as client:
+        with client_for(config, client) as client:
             return client.authenticate()
     except Exception as e:
         raise RuntimeError(f"Error de autenticación: {str(e)}")
 
 
-def enviar_entrega(token, data, config):
+def enviar_entrega(token, data, config, client=None):
     # Procesa y valida cada registro en STOCKS
     for reg in data.get("STOCKS", []):
         # Corrige FECHAPASEVT y PRECIOPASEVT
@@ -210,17 +169,17 @@ def enviar_entrega(token, data, config):
 
     try:
         print("📤 Enviando entrega mensual a la SSN...")
-        with SSNClient(config, debug=config.get('debug', False)) as client:
+        with client_for(config, client) as client:
             client.token = token
             client.post("entregaMensual", data)
             print("✅ Entrega mensual enviada correctamente")
     except Exception as e:
         raise RuntimeError(f"Error al enviar entrega mensual: {str(e)}")
 
-def confirmar_entrega(token, company, cronograma, config):
+def confirmar_entrega(token, company, cronograma, config, client=None):
     try:
         print("📋 Confirmando entrega mensual...")
-        with SSNClient(config, debug=config.get('debug', False)) as client:
+        with client_for(config, client) as client:
             client.token = token
             payload = {
                 "CODIGOCOMPANIA": company,
@@ -234,6 +193,8 @@ def confirmar_entrega(token, company, cronograma, config):
 
 def mover_archivo_procesado(data_file):
     # Mueve el archivo JSON procesado a data/processed/monthly/
+    # (shutil solo se importa en este camino: no encarece el arranque)
+    import shutil
     base_dir = os.path.dirname(data_file)
     # Si el archivo está en 'data', mover a 'data/processed/monthly/'
     if os.path.basename(base_dir) == 'data':
@@ -246,11 +207,11 @@ def mover_archivo_procesado(data_file):
     shutil.move(data_file, archivo_destino)
     print(f"📁 Archivo movido exitosamente a: {archivo_destino}")
 
-def fix_mes(token, company, cronograma, config):
+def fix_mes(token, company, cronograma, config, client=None):
     """Solicita rectificativa mensual usando PUT con el body requerido por la SSN."""
     try:
         print(f"🔄 Solicitando rectificativa para el mes {cronograma}...")
-        with SSNClient(config, debug=config.get('debug', False)) as client:
+        with client_for(config, client) as client:
             client.token = token
             payload = {
                 "cronograma": cronograma,
@@ -266,18 +227,19 @@ def fix_mes(token, company, cronograma, config):
     except Exception as e:
         raise RuntimeError(f"Error al pedir rectificativa mensual: {str(e)}")
 
-def query_mes(token, company, cronograma, config):
+def query_mes(token, company, cronograma, config, client=None):
     """Consulta el estado de un mes específico.
-    
+
     Args:
         token: Token de autenticación
         company: Código de la compañía
         cronograma: Mes a consultar (formato YYYY-MM)
         config: Configuración del script
+        client: Cliente SSN compartido (opcional)
     """
     try:
         print(f"📊 Consultando estado del mes {cronograma}...")
-        with SSNClient(config, debug=config.get('debug', False)) as client:
+        with client_for(config, client) as client:
             client.token = token
             params = {
                 "codigoCompania": company,
@@ -298,8 +260,13 @@ def query_mes(token, company, cronograma, config):
 
 def test_ssl_connection(config):
     """Prueba la conexión SSL con el servidor."""
+    # Se fuerza el handshake (ssl.probe): en operación normal el cliente lo
+    # omite y valida con la primera petición real, pero esta prueba existe
+    # justamente para hacer ese handshake; sin forzarlo "verificaría" sin
+    # ningún I/O de red
+    probe_config = dict(config, ssl=dict(config.get('ssl', {}), probe=True))
     try:
-        with SSNClient(config, debug=config.get('debug', False)) as client:
+        with SSNClient(probe_config, debug=config.get('debug', False)) as client:
             # La inicialización del cliente ya prueba la conexión SSL
             # Hacer un test simple adicional para confirmar que funciona
             base_url = config.get('baseUrl', '')
@@ -324,31 +291,35 @@ def main():
         test_ssl_connection(config)
         return
 
-    token = authenticate(config)
     company = os.getenv('SSN_COMPANY')
 
-    if query:
-        query_mes(token, company, query, config)
-        show_success_message("Consulta mensual completada exitosamente!")
-        return
-
-    if fix:
-        fix_mes(token, company, fix, config)
-        show_success_message("Rectificativa mensual solicitada exitosamente!")
-        return
-
-    if data_file:
-        with open(data_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if not all(k in data for k in ("CRONOGRAMA", "TIPOENTREGA", "STOCKS", "CODIGOCOMPANIA")):
-            raise ValueError("El JSON debe contener CRONOGRAMA, TIPOENTREGA, CODIGOCOMPANIA y STOCKS")
-        enviar_entrega(token, data, config)
-        if confirm:
-            confirmar_entrega(token, company, data['CRONOGRAMA'], config)
-            mover_archivo_procesado(data_file)
-            show_success_message("Entrega mensual enviada y confirmada exitosamente!")
-        else:
-            show_success_message("Entrega mensual enviada exitosamente!")
+    # Un solo SSNClient para toda la corrida: la verificación SSL se hace una
+    # vez y el keep-alive de httpx reutiliza la conexión TLS entre el login,
+    # la entrega y la confirmación (antes cada operación pagaba su handshake)
+    with SSNClient(config, debug=config.get('debug', False)) as client:
+        token = authenticate(config, client=client)
+
+        if query:
+            query_mes(token, company, query, config, client=client)
+            show_success_message("Consulta mensual completada exitosamente!")
+            return
+
+        if fix:
+            fix_mes(token, company, fix, config, client=client)
+            show_success_message("Rectificativa mensual solicitada exitosamente!")
+            return
+
+        if data_file:
+            data = load_json_file(data_file)
+            if not all(k in data for k in ("CRONOGRAMA", "TIPOENTREGA", "STOCKS", "CODIGOCOMPANIA")):
+                raise ValueError("El JSON debe contener CRONOGRAMA, TIPOENTREGA, CODIGOCOMPANIA y STOCKS")
+            enviar_entrega(token, data, config, client=client)
+            if confirm:
+                confirmar_entrega(token, company, data['CRONOGRAMA'], config, client=client)
+                mover_archivo_procesado(data_file)
+                show_success_message("Entrega mensual enviada y confirmada exitosamente!")
+            else:
+                show_success_message("Entrega mensual enviada exitosamente!")
 
 if __name__ == "__main__":
     try:
@@ -47,56 +47,21 @@ import sys
 import json
 import os
 import argparse
-import shutil
-import platform
 from dotenv import load_dotenv
 from datetime import datetime
-
-def show_error_message(error_message):
-    """Muestra un mensaje de error destacado y bien formateado."""
-    print("\n" + "="*80)
-    print("|| ⛔ ERROR:")
-    print("||")
-    # Dividir el mensaje en líneas para ajustar al ancho
-    for line in error_message.split('\n'):
-        if line.strip():
-            # Dividir líneas muy largas
-            while len(line) > 74:  # 80 - 4 (para "|| ") - 2 (margen)
-                print(f"|| {line[:74]}")
-                line = line[74:]
-            if line:
-                print(f"|| {line}")
-        else:
-            print("||")
-    print("||")
-    print("="*80)
-    print()  # Línea adicional después del cuadro de error
-
-def show_success_message(message="Operación completada exitosamente!"):
-    """Muestra un mensaje de éxito destacado y bien formateado."""
-    print("\n" + "="*80)
-    print("|| ✅ ÉXITO:")
-    print("||")
-    print(f"|| {message}")
-    print("||")
-    print("="*80)
-    print()  # Línea adicional después del cuadro de éxito
-
-# Configurar la codificación para sistemas Windows
-if platform.system() == "Windows":
-    # Forzar UTF-8 para stdout y stderr
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-    # Configurar la consola para UTF-8 si es posible
-    try:
-        os.system('chcp 65001 >nul 2>&1')
-    except:
-        pass
 from pathlib import Path
 import re
+import atexit
+import queue
 import logging
+import logging.handlers
 from lib.ssn_client import SSNClient  # TODO: Actualizar a ssn-client en v2.0
+# Código antes duplicado entre los scripts de carga, ahora compartido en lib
+from lib.script_utils import (configure_windows_console, show_error_message,
+                              show_success_message, client_for, load_json_file)
+
+# Configurar la codificación para sistemas Windows
+configure_windows_console()
 
 # Cargar variables de entorno desde el archivo .env en la raíz del proyecto
 env_path = Path(__file__).resolve().parents[1] / '.env'
@@ -208,16 +173,30 @@ def show_startup_banner(config):
 
 def setup_logging(debug_mode):
     """Configura el sistema de logging.
-    
+
     Args:
         debug_mode (bool): Si True, establece el nivel de logging a DEBUG
+
+    Los registros se encolan (QueueHandler) y un hilo de fondo los vuelca
+    a consola (QueueListener): cada log deja de bloquear el hilo principal
+    con una escritura sincrónica, algo visible en almacenamiento/terminales
+    lentos durante corridas con debug activado.
     """
-    # Configuración básica
-    logging.basicConfig(
-        level=logging.DEBUG if debug_mode else logging.WARNING,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if debug_mode else logging.WARNING)
+
+    if not root.handlers:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        log_queue = queue.Queue(-1)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        listener.start()
+        # Asegura que la cola se drene antes de terminar el proceso
+        atexit.register(listener.stop)
 
     # Ajustar niveles por logger
     if not debug_mode:
@@ -230,7 +209,7 @@ def setup_logging(debug_mode):
         for logger_name in ['httpx', 'httpcore', 'urllib3']:
             logging.getLogger(logger_name).setLevel(logging.WARNING)
 
-def authenticate(config, debug_enabled):
+def authenticate(config, debug_enabled, client=None):
     """
     Autenticación en el servicio de SSN usando el cliente HTTP.
     
@@ -245,12 +224,12 @@ def authenticate(config, debug_enabled):
         RuntimeError: Si hay error de autenticación
     """
     try:
-        with SSNClient(config, debug=debug_enabled) as client:
+        with client_for(config, client, debug_enabled) as client:
             return client.authenticate()
     except Exception as e:
         raise RuntimeError(f"Error de autenticación: {str(e)}")
 
-def enviar_entrega(token, company, records, cronograma, attempt, debug_enabled, config):
+def enviar_entrega(token, company, records, cronograma, attempt, debug_enabled, config, client=None):
     """Envía la entrega semanal al sistema SSN."""
     try:
         # Validar y agregar CODIGOCOMPANIA a cada registro
@@ -266,7 +245,7 @@ def enviar_entrega(token, company, records, cronograma, attempt, debug_enabled,
             "OPERACIONES": records
         }
 
-        with SSNClient(config, debug=debug_enabled) as client:
+        with client_for(config, client, debug_enabled) as client:
             client.token = token
             client.post("entregaSemanal", payload)
             print(json.dumps({
@@ -277,10 +256,10 @@ def enviar_entrega(token, company, records, cronograma, attempt, debug_enabled,
     except Exception as e:
         raise RuntimeError(f"Error al enviar entrega semanal: {str(e)}")
 
-def confirmar_entrega(token, company, cronograma, attempt, debug_enabled, config):
+def confirmar_entrega(token, company, cronograma, attempt, debug_enabled, config, client=None):
     """Confirma la entrega semanal en el sistema de la SSN."""
     try:
-        with SSNClient(config, debug=debug_enabled) as client:
+        with client_for(config, client, debug_enabled) as client:
             client.token = token
             payload = {
                 "CODIGOCOMPANIA": company,
@@ -296,6 +275,8 @@ def confirmar_entrega(token, company, cronograma, attempt, debug_enabled, config
 def mover_archivo_procesado(data_file):
     """Mueve el archivo JSON procesado a la carpeta processed/weekly/."""
     try:
+        # shutil solo se importa en este camino: no encarece el arranque
+        import shutil
         # Crear directorio processed/weekly/ si no existe
         processed_dir = os.path.join(os.path.dirname(data_file), "processed", "weekly")
         os.makedirs(processed_dir, exist_ok=True)
@@ -308,7 +289,7 @@ def mover_archivo_procesado(data_file):
         print(f"Error al mover el archivo: {str(e)}", file=sys.stderr)
         raise
 
-def fix_semana(token, company, cronograma, attempt, debug_enabled, config):
+def fix_semana(token, company, cronograma, attempt, debug_enabled, config, client=None):
     """Envía una corrección (rectificativa) para una semana específica usando PUT.
     Args:
         token: Token de autenticación
@@ -321,7 +302,7 @@ def fix_semana(token, company, cronograma, attempt, debug_enabled, config):
         RuntimeError: Si hay un error al procesar la solicitud
     """
     try:
-        with SSNClient(config, debug=debug_enabled) as client:
+        with client_for(config, client, debug_enabled) as client:
             client.token = token
             payload = {
                 "cronograma": cronograma,
@@ -334,7 +315,7 @@ def fix_semana(token, company, cronograma, attempt, debug_enabled, config):
     except Exception as e:
         raise RuntimeError(f"Error al pedir rectificativa: {str(e)}")
 
-def query_semana(token, company, cronograma, attempt, debug_enabled, config):
+def query_semana(token, company, cronograma, attempt, debug_enabled, config, client=None):
     """Consulta el estado de una semana específica.
     
     Args:
@@ -347,7 +328,7 @@ def query_semana(token, company, cronograma, attempt, debug_enabled, config):
     """
     try:
         print(f"📊 Consultando estado de la semana {cronograma}...")
-        with SSNClient(config, debug=debug_enabled) as client:
+        with client_for(config, client, debug_enabled) as client:
             client.token = token
             params = {
                 "codigoCompania": company,
@@ -378,9 +359,8 @@ def load_data(data_file):
     """
     if not os.path.isfile(data_file):
         raise FileNotFoundError(f"No se encuentra el archivo de datos: {data_file}")
-    
-    with open(data_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+
+    data = load_json_file(data_file)
     
     # Validar estructura mínima requerida
     if not isinstance(data, dict):
@@ -393,7 +373,7 @@ def load_data(data_file):
     
     return data
 
-def send_empty_week(token, company, cronograma, attempt, debug_enabled, config):
+def send_empty_week(token, company, cronograma, attempt, debug_enabled, config, client=None):
     """Envía una semana sin operaciones.
     
     Args:
@@ -411,7 +391,7 @@ def send_empty_week(token, company, cronograma, attempt, debug_enabled, config):
         RuntimeError: Si hay un error al procesar la solicitud
     """
     try:
-        with SSNClient(config, debug=debug_enabled) as client:
+        with client_for(config, client, debug_enabled) as client:
             client.token = token
             
             # Crear payload con orden específico de campos
@@ -431,8 +411,13 @@ def send_empty_week(token, company, cronograma, attempt, debug_enabled, config):
 
 def test_ssl_connection(config):
     """Prueba la conexión SSL con el servidor."""
+    # Se fuerza el handshake (ssl.probe): en operación normal el cliente lo
+    # omite y valida con la primera petición real, pero esta prueba existe
+    # justamente para hacer ese handshake; sin forzarlo "verificaría" sin
+    # ningún I/O de red
+    probe_config = dict(config, ssl=dict(config.get('ssl', {}), probe=True))
     try:
-        with SSNClient(config, debug=False) as client:
+        with SSNClient(probe_config, debug=False) as client:
             # La inicialización del cliente ya prueba la conexión SSL
             # Los mensajes se muestran automáticamente desde el SSNClient
             return True
@@ -471,74 +456,81 @@ def main():
         if not company:
             raise RuntimeError("Falta la variable de entorno SSN_COMPANY")
         
-        # Iniciar sesión
-        token = authenticate(config, config.get('debug', False))
-        
-        # Número máximo de reintentos (por defecto 3 si no está especificado)
-        max_retries = config.get('retries', 3)
-        
-        if query_week:
-            for attempt in range(1, max_retries + 1):
-                try:
-                    if query_semana(token, company, query_week, attempt, config.get('debug', False), config):
-                        show_success_message("Consulta de semana completada exitosamente!")
-                        break
-                except RuntimeError as e:
-                    if attempt == max_retries:
-                        raise
-                    print(f"Intento {attempt} fallido: {str(e)}")
-        elif fix_week:
-            for attempt in range(1, max_retries + 1):
-                try:
-                    if fix_semana(token, company, fix_week, attempt, config.get('debug', False), config):
-                        show_success_message("Rectificativa de semana solicitada exitosamente!")
-                        break
-                except RuntimeError as e:
-                    if attempt == max_retries:
-                        raise
-                    print(f"Intento {attempt} fallido: {str(e)}")
-        elif empty_week:
-            for attempt in range(1, max_retries + 1):
-                try:
-                    if send_empty_week(token, company, empty_week, attempt, config.get('debug', False), config):
-                        show_success_message("Semana vacía enviada exitosamente!")
-                        break
-                except RuntimeError as e:
-                    if attempt == max_retries:
-                        raise
-                    print(f"Intento {attempt} fallido: {str(e)}")
-        else:
-            # Cargar datos desde el archivo JSON
-            data = load_data(data_file)
-            
-            # Intentar enviar los datos con reintentos
-            for attempt in range(1, max_retries + 1):
-                try:
-                    if enviar_entrega(token, company, data["OPERACIONES"], data["CRONOGRAMA"], 
-                                    attempt, config.get('debug', False), config):
-                        # Solo mostrar mensaje si no hay confirmación pendiente
-                        if not confirm_week:
-                            show_success_message("Entrega semanal enviada exitosamente!")
-                        break
-                except RuntimeError as e:
-                    if attempt == max_retries:
-                        raise
-                    print(f"Intento {attempt} fallido: {str(e)}")
-            
-            # Si se solicitó confirmar la entrega
-            if confirm_week:
+        debug_enabled = config.get('debug', False)
+
+        # Un solo SSNClient para toda la corrida: la verificación SSL se hace
+        # una vez y el keep-alive de httpx reutiliza la conexión TLS entre el
+        # login, los reintentos y la confirmación (antes cada operación y cada
+        # reintento pagaban su propio handshake)
+        with SSNClient(config, debug=debug_enabled) as client:
+            # Iniciar sesión
+            token = authenticate(config, debug_enabled, client=client)
+
+            # Número máximo de reintentos (por defecto 3 si no está especificado)
+            max_retries = config.get('retries', 3)
+
+            if query_week:
                 for attempt in range(1, max_retries + 1):
                     try:
-                        if confirmar_entrega(token, company, data["CRONOGRAMA"], 
-                                          attempt, config.get('debug', False), config):
-                            # Si la confirmación fue exitosa, mover el archivo
-                            mover_archivo_procesado(data_file)
-                            show_success_message("Entrega semanal enviada y confirmada exitosamente!")
+                        if query_semana(token, company, query_week, attempt, debug_enabled, config, client=client):
+                            show_success_message("Consulta de semana completada exitosamente!")
                             break
                     except RuntimeError as e:
                         if attempt == max_retries:
                             raise
                         print(f"Intento {attempt} fallido: {str(e)}")
+            elif fix_week:
+                for attempt in range(1, max_retries + 1):
+                    try:
+                        if fix_semana(token, company, fix_week, attempt, debug_enabled, config, client=client):
+                            show_success_message("Rectificativa de semana solicitada exitosamente!")
+                            break
+                    except RuntimeError as e:
+                        if attempt == max_retries:
+                            raise
+                        print(f"Intento {attempt} fallido: {str(e)}")
+            elif empty_week:
+                for attempt in range(1, max_retries + 1):
+                    try:
+                        if send_empty_week(token, company, empty_week, attempt, debug_enabled, config, client=client):
+                            show_success_message("Semana vacía enviada exitosamente!")
+                            break
+                    except RuntimeError as e:
+                        if attempt == max_retries:
+                            raise
+                        print(f"Intento {attempt} fallido: {str(e)}")
+            else:
+                # Cargar datos desde el archivo JSON
+                data = load_data(data_file)
+
+                # Intentar enviar los datos con reintentos
+                for attempt in range(1, max_retries + 1):
+                    try:
+                        if enviar_entrega(token, company, data["OPERACIONES"], data["CRONOGRAMA"],
+                                        attempt, debug_enabled, config, client=client):
+                            # Solo mostrar mensaje si no hay confirmación pendiente
+                            if not confirm_week:
+                                show_success_message("Entrega semanal enviada exitosamente!")
+                            break
+                    except RuntimeError as e:
+                        if attempt == max_retries:
+                            raise
+                        print(f"Intento {attempt} fallido: {str(e)}")
+
+                # Si se solicitó confirmar la entrega
+                if confirm_week:
+                    for attempt in range(1, max_retries + 1):
+                        try:
+                            if confirmar_entrega(token, company, data["CRONOGRAMA"],
+                                              attempt, debug_enabled, config, client=client):
+                                # Si la confirmación fue exitosa, mover el archivo
+                                mover_archivo_procesado(data_file)
+                                show_success_message("Entrega semanal enviada y confirmada exitosamente!")
+                                break
+                        except RuntimeError as e:
+                            if attempt == max_retries:
+                                raise
+                            print(f"Intento {attempt} fallido: {str(e)}")
     
     except (FileNotFoundError, ValueError) as e:
         # Errores de configuración temprana - mostrar banner básico si no se ha mostrado aún